@@ -1,8 +1,11 @@
 import pandas as pd
 import json
+import orjson
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import numpy as np
+import io
 import os
 from sqlalchemy import create_engine, text
 
@@ -13,12 +16,35 @@ def load_and_clean_data(bills_path, legislators_path, bill_sponsors_path,
     Load and clean the raw data files, integrating policy information.
     """
     print("Loading data files...")
-    # Load all data files
-    bills_df = pd.read_csv(bills_path)
-    legislators_df = pd.read_csv(legislators_path)
-    bill_sponsors_df = pd.read_csv(bill_sponsors_path, low_memory=False)
-    bill_policies_df = pd.read_csv(bill_policies_path)
-    bill_policy_links_df = pd.read_csv(bill_policy_links_path)
+    # Load the four independent files concurrently; the CSV parsers release
+    # the GIL, so the load phase costs roughly the slowest read instead of
+    # their sum. Explicit usecols/dtypes skip type inference and keep only
+    # the columns the pipeline actually touches. The sponsor file streams
+    # separately below because its filter depends on the bills frame.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        bills_future = executor.submit(
+            pd.read_csv,
+            bills_path,
+            engine='pyarrow',
+            usecols=['bill_number', 'congress', 'title', 'latest_action_date',
+                     'latest_action_text', 'origin_chamber'],
+            dtype={'congress': 'int16', 'bill_number': 'string'},
+            parse_dates=['latest_action_date']
+        )
+        legislators_future = executor.submit(
+            pd.read_csv, legislators_path, engine='pyarrow'
+        )
+        policies_future = executor.submit(
+            pd.read_csv, bill_policies_path, engine='pyarrow'
+        )
+        links_future = executor.submit(
+            pd.read_csv, bill_policy_links_path, engine='pyarrow'
+        )
+
+        bills_df = bills_future.result()
+        legislators_df = legislators_future.result()
+        bill_policies_df = policies_future.result()
+        bill_policy_links_df = links_future.result()
     
     print("\nInitial data shapes:")
     print(f"Bills: {bills_df.shape}")
@@ -28,36 +54,55 @@ def load_and_clean_data(bills_path, legislators_path, bill_sponsors_path,
     print("Filtering by congress...")
     # Filter bills for target congress
     bills_df = bills_df[bills_df['congress'] >= target_congress].copy()
+
+    # Stream the (large) sponsor file in chunks, keeping only Primary and
+    # Cosponsor rows for bills that survived the congress filter, so peak
+    # memory is bounded by the chunk size rather than the file size.
+    # chunksize is a C-engine feature, hence no engine='pyarrow' here.
+    valid_bills = set(bills_df['bill_number'])
+    sponsor_chunks = []
+    for chunk in pd.read_csv(
+        bill_sponsors_path,
+        chunksize=500_000,
+        usecols=['bill_number', 'bioguide_id', 'sponsor_type'],
+        dtype={'bill_number': 'string', 'bioguide_id': 'category',
+               'sponsor_type': 'category'}
+    ):
+        sponsor_chunks.append(chunk[
+            chunk['bill_number'].isin(valid_bills) &
+            chunk['sponsor_type'].isin(['Primary', 'Cosponsor'])
+        ])
+    bill_sponsors_df = pd.concat(sponsor_chunks, ignore_index=True, copy=False)
     
     # Sort by latest action date and keep most recent bills
-    bills_df['latest_action_date'] = pd.to_datetime(
-        bills_df['latest_action_date'], errors='coerce'
-    )
+    # (latest_action_date already parsed as datetime at read time)
     bills_df = bills_df.sort_values('latest_action_date', ascending=False)
     
     # Clean legislators data
-    legislators_df['full_name'] = legislators_df.apply(
-        lambda x: f"{x['first_name']} {x['last_name']}", axis=1
+    legislators_df['full_name'] = (
+        legislators_df['first_name'].astype('string') + ' ' +
+        legislators_df['last_name'].astype('string')
     )
     legislators_df['district'] = legislators_df['district'].fillna(-1).astype(int)
     legislators_df['party'] = legislators_df['party'].fillna('O')
     
     print("\nAdding policy information...")
-    # First merge: bills with policy links
-    bills_df = bills_df.merge(
-        bill_policy_links_df,
-        on='bill_number',
-        how='left'
-    )
-    print("Columns after first merge:", bills_df.columns.tolist())
-    
-    # Second merge: add policy names
-    bills_df = bills_df.merge(
+    # Pre-join the two small policy tables once, then bring the result into
+    # bills with a single left merge; validate= guards against silent row
+    # blow-ups if either key ever stops being unique
+    policy_map = bill_policy_links_df.merge(
         bill_policies_df.rename(columns={'name': 'policy_name'}),
         on='policy_id',
-        how='left'
+        how='left',
+        validate='many_to_one'
     )
-    print("Columns after second merge:", bills_df.columns.tolist())
+    bills_df = bills_df.merge(
+        policy_map,
+        on='bill_number',
+        how='left',
+        validate='many_to_one'
+    )
+    print("Columns after policy merge:", bills_df.columns.tolist())
     
     # Format dates back to string for JSON
     bills_df['latest_action_date'] = bills_df['latest_action_date'].dt.strftime('%Y-%m-%d')
@@ -75,113 +120,105 @@ def create_legislator_nodes(legislators_df):
     """
     Create the legislators array with essential information.
     """
-    return [
-        {
-            'id': row['bioguide_id'],
-            'name': row['full_name'],
-            'state': row['state'],
-            'district': int(row['district']) if row['district'] != -1 else None,
-            'party': row['party'],
-            'first_name': row['first_name'],
-            'last_name': row['last_name']
-        }
-        for _, row in legislators_df.iterrows()
-    ]
+    nodes = legislators_df[[
+        'bioguide_id', 'full_name', 'state', 'district',
+        'party', 'first_name', 'last_name'
+    ]].rename(columns={'bioguide_id': 'id', 'full_name': 'name'})
+
+    # Sentinel -1 districts (at-large / senators) become None in the JSON
+    nodes['district'] = np.where(
+        nodes['district'] == -1, None, nodes['district'].astype(object)
+    )
+
+    return nodes.to_dict(orient='records')
 
 def process_bills(bills_df):
     """
     Create the bills array with essential information including policy data.
     """
-    return [
-        {
-            'bill_number': row['bill_number'],
-            'congress': row['congress'],
-            'title': row['title'],
-            'latest_action_date': row['latest_action_date'],
-            'latest_action_text': row['latest_action_text'],
-            'origin_chamber': row['origin_chamber'],
-            'policy_id': row['policy_id'] if pd.notna(row['policy_id']) else None,
-            'policy_name': row['policy_name'] if pd.notna(row['policy_name']) else 'Uncategorized'
-        }
-        for _, row in bills_df.iterrows()
-    ]
+    bills = bills_df[[
+        'bill_number', 'congress', 'title', 'latest_action_date',
+        'latest_action_text', 'origin_chamber', 'policy_id', 'policy_name'
+    ]].copy()
+
+    bills['policy_name'] = bills['policy_name'].fillna('Uncategorized')
+    bills['policy_id'] = bills['policy_id'].where(bills['policy_id'].notna(), None)
+
+    return bills.to_dict(orient='records')
 
 def process_collaborations(bill_sponsors_df, bills_df):
     """
     Create the collaborations array focusing on primary sponsor relationships.
     """
-    # Create bill info lookup
-    bill_info = {}
-    for _, row in bills_df.iterrows():
-        bill_info[row['bill_number']] = {
-            'congress': row['congress'],
-            'title': row['title'],
-            'latest_action_text': row['latest_action_text'],
-            'latest_action_date': row['latest_action_date']
-        }
-    
-    # First find primary sponsors
-    primary_sponsors = bill_sponsors_df[
-        bill_sponsors_df['sponsor_type'] == 'Primary'
-    ].set_index('bill_number')['bioguide_id'].to_dict()
-    
-    # Count meaningful collaborations
-    collaboration_counts = defaultdict(int)
-    valid_bills = set(bill_info.keys())
-    
-    for bill_number, group in bill_sponsors_df[
-        (bill_sponsors_df['bill_number'].isin(valid_bills)) &
-        (bill_sponsors_df['sponsor_type'] == 'Cosponsor')
-    ].groupby('bill_number'):
-        if bill_number not in primary_sponsors:
-            continue
-            
-        primary_sponsor = primary_sponsors[bill_number]
-        cosponsors = group['bioguide_id'].tolist()
-        
-        # Connect primary sponsor to each cosponsor
-        for cosponsor in cosponsors:
-            pair = tuple(sorted([primary_sponsor, cosponsor]))
-            collaboration_counts[pair] += 1
-    
+    # Restrict sponsors to bills we actually kept
+    valid_bills = set(bills_df['bill_number'])
+    sponsors = bill_sponsors_df[bill_sponsors_df['bill_number'].isin(valid_bills)]
+
+    # Factorize bioguide_id so pair building runs on int32 codes instead of
+    # allocating string/tuple objects per pair; map back to ids at the end
+    sponsor_codes, sponsor_ids = pd.factorize(sponsors['bioguide_id'])
+    sponsors = sponsors.assign(bioguide_id=sponsor_codes.astype(np.int32))
+
+    # Likewise factorize bill_number to a shared int32 code and sort both
+    # sides on it, so the joins below walk sorted int keys linearly instead
+    # of hashing strings
+    bills_meta = bills_df.drop_duplicates('bill_number')[[
+        'bill_number', 'congress', 'title',
+        'latest_action_text', 'latest_action_date'
+    ]]
+    bill_index = pd.Index(bills_meta['bill_number'])
+    sponsors = sponsors.assign(
+        bill_code=bill_index.get_indexer(sponsors['bill_number']).astype(np.int32)
+    )
+    bills_meta = bills_meta.assign(
+        bill_code=np.arange(len(bills_meta), dtype=np.int32)
+    )
+
+    primaries = sponsors[sponsors['sponsor_type'] == 'Primary'][
+        ['bill_code', 'bioguide_id']
+    ].drop_duplicates('bill_code', keep='last').rename(
+        columns={'bioguide_id': 'primary'}
+    ).sort_values('bill_code')
+    cosponsors = sponsors[sponsors['sponsor_type'] == 'Cosponsor'][
+        ['bill_code', 'bioguide_id']
+    ].rename(columns={'bioguide_id': 'cosponsor'}).sort_values('bill_code')
+
+    # One join on the sorted codes yields every (primary, cosponsor, bill)
+    # triple at once
+    pairs = primaries.merge(
+        cosponsors, on='bill_code', how='inner', validate='one_to_many'
+    )
+
+    # Canonical ordering so (A, B) and (B, A) count as the same pair
+    pairs['source'] = np.minimum(pairs['primary'], pairs['cosponsor'])
+    pairs['target'] = np.maximum(pairs['primary'], pairs['cosponsor'])
+
     # Filter to keep only significant collaborations
     min_collaborations = 2
-    significant_pairs = {
-        pair: count for pair, count in collaboration_counts.items()
-        if count >= min_collaborations
-    }
-    
-    print(f"Found {len(significant_pairs)} significant primary-cosponsor relationships")
-    
-    # Create detailed collaboration records
-    collaborations = []
-    
-    for bill_number in valid_bills:
-        if bill_number not in primary_sponsors:
-            continue
-            
-        primary_sponsor = primary_sponsors[bill_number]
-        cosponsors = bill_sponsors_df[
-            (bill_sponsors_df['bill_number'] == bill_number) &
-            (bill_sponsors_df['sponsor_type'] == 'Cosponsor')
-        ]['bioguide_id'].tolist()
-        
-        bill_data = bill_info[bill_number]
-        
-        for cosponsor in cosponsors:
-            pair = tuple(sorted([primary_sponsor, cosponsor]))
-            if pair in significant_pairs:
-                collaborations.append({
-                    'source': pair[0],
-                    'target': pair[1],
-                    'bill_number': bill_number,
-                    'congress': bill_data['congress'],
-                    'title': bill_data['title'],
-                    'latest_action': bill_data['latest_action_text'],
-                    'action_date': bill_data['latest_action_date'],
-                    'relationship': 'Primary-Cosponsor'
-                })
-    
+    pair_sizes = pairs.groupby(['source', 'target'])['bill_code'].transform('size')
+    significant = pairs[pair_sizes >= min_collaborations]
+
+    n_pairs = len(significant[['source', 'target']].drop_duplicates())
+    print(f"Found {n_pairs} significant primary-cosponsor relationships")
+
+    # Attach bill metadata (and the original bill_number) in a single merge
+    records = significant.merge(
+        bills_meta, on='bill_code', how='left'
+    ).rename(columns={
+        'latest_action_text': 'latest_action',
+        'latest_action_date': 'action_date'
+    })
+    records['relationship'] = 'Primary-Cosponsor'
+
+    # Translate the int32 codes back to bioguide_ids
+    records['source'] = sponsor_ids[records['source'].to_numpy()]
+    records['target'] = sponsor_ids[records['target'].to_numpy()]
+
+    collaborations = records[[
+        'source', 'target', 'bill_number', 'congress', 'title',
+        'latest_action', 'action_date', 'relationship'
+    ]].to_dict(orient='records')
+
     print(f"Generated {len(collaborations)} primary-cosponsor collaboration records")
     return collaborations
 
@@ -189,45 +226,48 @@ def calculate_sponsor_stats(legislators, collaborations):
     """
     Calculate sponsorship statistics for each legislator.
     """
-    stats = defaultdict(lambda: {
-        'primary_count': 0,
-        'cosponsor_count': 0,
-        'total_collaborations': 0,
-        'party_collaborations': defaultdict(int)
-    })
-    
+    if not collaborations:
+        return {}
+
     # Create party lookup
-    party_lookup = {leg['id']: leg['party'] for leg in legislators}
-    
-    for collab in collaborations:
-        source_id = collab['source']
-        target_id = collab['target']
-        
-        # Update source stats
-        stats[source_id]['total_collaborations'] += 1
-        stats[source_id]['party_collaborations'][party_lookup.get(target_id, 'O')] += 1
-        
-        # Update target stats
-        stats[target_id]['total_collaborations'] += 1
-        stats[target_id]['party_collaborations'][party_lookup.get(source_id, 'O')] += 1
-    
-    return dict(stats)
+    party_lookup = pd.Series({leg['id']: leg['party'] for leg in legislators})
 
-def convert_to_serializable(obj):
+    edges_df = pd.DataFrame(collaborations)[['source', 'target']]
+
+    # Symmetric long form: one row per (legislator, counterpart) incidence,
+    # so a single groupby replaces the two dict updates per edge
+    long_edges = pd.concat([
+        edges_df.rename(columns={'source': 'self', 'target': 'other'}),
+        edges_df.rename(columns={'target': 'self', 'source': 'other'})
+    ], ignore_index=True)
+    long_edges['other_party'] = long_edges['other'].map(party_lookup).fillna('O')
+
+    by_party = long_edges.groupby(['self', 'other_party']).size().unstack(fill_value=0)
+    totals = by_party.sum(axis=1).to_dict()
+
+    return {
+        leg_id: {
+            'primary_count': 0,
+            'cosponsor_count': 0,
+            'total_collaborations': int(totals[leg_id]),
+            'party_collaborations': {
+                party: int(count) for party, count in counts.items() if count
+            }
+        }
+        for leg_id, counts in by_party.to_dict(orient='index').items()
+    }
+
+def _json_default(obj):
     """
-    Convert numpy/pandas types to Python native types for JSON serialization.
+    orjson fallback for the few types OPT_SERIALIZE_NUMPY does not cover.
     """
-    if isinstance(obj, (np.int64, np.int32, np.int16, np.int8)):
-        return int(obj)
-    elif isinstance(obj, (np.float64, np.float32, np.float16)):
-        return float(obj)
-    elif isinstance(obj, dict):
-        return {key: convert_to_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [convert_to_serializable(item) for item in obj]
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    return obj
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 def prepare_network_data(bills_path, legislators_path, bill_sponsors_path, 
                         bill_policies_path, bill_policy_links_path, target_congress=117):
@@ -240,23 +280,24 @@ def prepare_network_data(bills_path, legislators_path, bill_sponsors_path,
         bill_policies_path, bill_policy_links_path, target_congress
     )
     
-    print("Creating legislator nodes...")
-    all_legislators = create_legislator_nodes(legislators_df)
-    
     print("Processing bills...")
     bills = process_bills(bills_df)
-    
+
     print("Processing collaborations...")
     collaborations = process_collaborations(bill_sponsors_df, bills_df)
-    
-    # Get active legislators and their metrics
-    active_legislators = set()
-    for collab in collaborations:
-        active_legislators.add(collab['source'])
-        active_legislators.add(collab['target'])
-    
-    legislators = [leg for leg in all_legislators if leg['id'] in active_legislators]
-    
+
+    # Keep only legislators that appear on at least one collaboration edge,
+    # filtering the frame once before node records are built
+    edges_df = pd.DataFrame(collaborations, columns=['source', 'target'])
+    active_legislators = pd.unique(np.concatenate([
+        edges_df['source'].to_numpy(), edges_df['target'].to_numpy()
+    ]))
+
+    print("Creating legislator nodes...")
+    legislators = create_legislator_nodes(
+        legislators_df[legislators_df['bioguide_id'].isin(active_legislators)]
+    )
+
     print(f"Filtered to {len(legislators)} active legislators")
     
     print("Calculating metrics...")
@@ -268,13 +309,9 @@ def prepare_network_data(bills_path, legislators_path, bill_sponsors_path,
             legislator['metrics'] = metrics[legislator['id']]
     
     # Get policy information
-    policies = [
-        {
-            'id': str(row['policy_id']),
-            'name': row['name']
-        }
-        for _, row in bill_policies_df.iterrows()
-    ]
+    policies = bill_policies_df.assign(
+        id=bill_policies_df['policy_id'].astype(str)
+    )[['id', 'name']].to_dict(orient='records')
     
     # Count bills per policy
     policy_counts = defaultdict(int)
@@ -326,9 +363,19 @@ def prepare_network_data(bills_path, legislators_path, bill_sponsors_path,
         'metadata': metadata
     }
 
-def upload_to_database(network_data):
+def _copy_escape(s):
+    """
+    Escape a JSON string for COPY's text format. json escapes control
+    characters itself, so doubling backslashes is enough to keep the
+    payload clear of COPY's tab/newline framing.
+    """
+    return s.replace('\\', '\\\\')
+
+def upload_to_database(network_data, payload=None):
     """
-    Upload the complete network data as a single JSON structure
+    Upload the complete network data as a single JSON structure.
+    Accepts the already-serialized JSON bytes from main so the structure
+    is not encoded a second time.
     """
     try:
         # Create database connection
@@ -355,22 +402,43 @@ def upload_to_database(network_data):
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
             """))
-            
-            # Convert data to serializable format
-            serializable_data = convert_to_serializable(network_data)
-            congress_range_json = json.dumps(network_data['metadata']['congress_range'])
-            data_json = json.dumps(serializable_data)
-            
-            # Simple insert with pre-formatted JSON
+
+            # The API reads ORDER BY created_at DESC LIMIT 1; with this
+            # index that is a top-1 index scan instead of a full sort,
+            # regardless of how many historical uploads accumulate
             conn.execute(text("""
-                INSERT INTO network_data (congress_range, data)
-                VALUES (:congress_range, :data);
-            """),
-            {
-                "congress_range": congress_range_json,
-                "data": data_json
-            })
-            
+                CREATE INDEX IF NOT EXISTS idx_network_data_created_at
+                ON network_data (created_at DESC);
+            """))
+
+        # Reuse the serialized payload when main already produced it
+        if payload is None:
+            payload = orjson.dumps(
+                network_data,
+                default=_json_default,
+                option=orjson.OPT_SERIALIZE_NUMPY
+            )
+        congress_range_json = json.dumps(network_data['metadata']['congress_range'])
+        data_json = payload.decode('utf-8')
+
+        # Stream the multi-MB blob through COPY's bulk path instead of a
+        # bind parameter on a one-row INSERT
+        raw = engine.raw_connection()
+        try:
+            buf = io.StringIO()
+            buf.write(_copy_escape(congress_range_json))
+            buf.write('\t')
+            buf.write(_copy_escape(data_json))
+            buf.write('\n')
+            buf.seek(0)
+            cursor = raw.cursor()
+            cursor.copy_expert(
+                "COPY network_data (congress_range, data) FROM STDIN", buf
+            )
+            raw.commit()
+        finally:
+            raw.close()
+
         print("Network data successfully uploaded to database!")
         print(f"Congress Range: {network_data['metadata']['congress_range']}")
         print(f"Legislators: {len(network_data['legislators'])}")
@@ -403,19 +471,24 @@ def main():
             target_congress=117
         )
         
-        # Save to JSON (original functionality)
+        # Save to JSON (original functionality); orjson encodes numpy
+        # scalars natively, so no pre-conversion pass over the structure
         print("\nSaving data to JSON file...")
-        serializable_data = convert_to_serializable(network_data)
-        with open('network_data_sql.json', 'w', encoding='utf-8') as f:
-            json.dump(serializable_data, f, ensure_ascii=False)
+        payload = orjson.dumps(
+            network_data,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY
+        )
+        with open('network_data_sql.json', 'wb') as f:
+            f.write(payload)
             f.flush()
             os.fsync(f.fileno())
-        
+
         file_size = os.path.getsize('network_data_sql.json')
         print(f"\nSuccessfully wrote {file_size / (1024*1024):.2f} MB of JSON data")
-        
-        # Upload to database as single JSON structure
-        upload_to_database(network_data)
+
+        # Upload to database, reusing the bytes we just wrote to disk
+        upload_to_database(network_data, payload)
         
     except Exception as e:
         print(f"Error in process: {str(e)}")
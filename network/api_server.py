@@ -1,19 +1,28 @@
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
 from flask_caching import Cache
 from sqlalchemy import create_engine, text
+import gzip
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 app = Flask(__name__, static_folder='.')
 CORS(app)
-cache = Cache(app, config={'CACHE_TYPE': 'simple'})
 
 # Cache duration
 hour = 3600
 CACHE_DURATION = 2*hour
 
+# Filesystem cache is shared across gunicorn workers, so the database is
+# queried once per expiry for the whole app instead of once per process,
+# and the payload is not duplicated in every worker's memory
+cache = Cache(app, config={
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': os.getenv('CACHE_DIR', '/tmp/policyposse_cache'),
+    'CACHE_DEFAULT_TIMEOUT': CACHE_DURATION
+})
+
 def get_db_connection():
     """Create SQLAlchemy engine with connection details"""
     db_params = {
@@ -27,36 +36,91 @@ def get_db_connection():
     connection_string = f"postgresql://{db_params['user']}:{db_params['password']}@{db_params['host']}:{db_params['port']}/{db_params['database']}"
     return create_engine(connection_string)
 
+# Create the engine once at import so the connection pool is reused across
+# requests; create_engine doesn't open a connection, so this is safe even
+# before the database is reachable
+engine = get_db_connection()
+
+# Statement built once so cache misses reuse the compiled query.
+# data is cast to text server-side: the payload is already JSON, so there
+# is no reason to decode it into Python dicts just to re-encode per request
+NETWORK_DATA_QUERY = text("""
+    SELECT data::text
+    FROM network_data
+    ORDER BY created_at DESC
+    LIMIT 1;
+""")
+
 @cache.cached(timeout=CACHE_DURATION, key_prefix='network_data')
 def get_network_data():
-    """Get network data from database with caching"""
+    """Get the network data from database as (raw, gzipped) JSON bytes"""
     try:
         print("Fetching data from database...")  # Debug print
-        engine = get_db_connection()
-        
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT data 
-                FROM network_data 
-                ORDER BY created_at DESC 
-                LIMIT 1;
-            """))
+            result = conn.execute(NETWORK_DATA_QUERY)
             row = result.fetchone()
             if row:
                 print("Data successfully fetched from database")  # Debug print
-                return row[0]
+                raw = row[0].encode('utf-8')
+                # Compress once per cache fill instead of per request
+                return raw, gzip.compress(raw, compresslevel=6)
             print("No data found in database")  # Debug print
             return None
     except Exception as e:
         print(f"Database error: {e}")  # Debug print
         return None
 
+# Top-level sections of the network blob that may be fetched individually
+NETWORK_SECTIONS = ('legislators', 'bills', 'collaborations', 'policies',
+                    'metadata')
+
+SECTION_QUERY = text("""
+    SELECT (data -> :section)::text
+    FROM network_data
+    ORDER BY created_at DESC
+    LIMIT 1;
+""")
+
+@cache.memoize(timeout=CACHE_DURATION)
+def get_network_section(section):
+    """Get one section of the network data as JSON bytes, cached per section"""
+    try:
+        print(f"Fetching {section} from database...")  # Debug print
+        with engine.connect() as conn:
+            row = conn.execute(SECTION_QUERY, {'section': section}).fetchone()
+            if row and row[0] is not None:
+                return row[0].encode('utf-8')
+            return None
+    except Exception as e:
+        print(f"Database error: {e}")  # Debug print
+        return None
+
 @app.route('/api/network-data')
 def network_data():
     """API endpoint to get network data"""
     data = get_network_data()
     if data:
-        return jsonify(data)
+        raw, gzipped = data
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            return Response(gzipped, mimetype='application/json',
+                            headers={'Content-Encoding': 'gzip',
+                                     'Vary': 'Accept-Encoding'})
+        return Response(raw, mimetype='application/json',
+                        headers={'Vary': 'Accept-Encoding'})
+    return jsonify({'error': 'No data available'}), 404
+
+@app.route('/api/network-data/<section>')
+def network_data_section(section):
+    """API endpoint for a single section of the network data
+
+    Postgres projects the slice with data -> section, so only the bytes a
+    view actually needs cross the wire instead of the whole blob.
+    """
+    if section not in NETWORK_SECTIONS:
+        return jsonify({'error': f'Unknown section: {section}'}), 404
+    data = get_network_section(section)
+    if data:
+        return Response(data, mimetype='application/json')
     return jsonify({'error': 'No data available'}), 404
 
 @app.route('/')